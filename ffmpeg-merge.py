@@ -1,69 +1,135 @@
 #!/usr/bin/env python
 
+import csv
 import os
 import sys
 import subprocess
 import json
 import re
 import locale
+from optparse import OptionParser
+from concurrent.futures import ThreadPoolExecutor
 from operator import itemgetter
 from pathlib import Path
 
-# Set the locale to handle UTF-8
-try:
-    locale.setlocale(locale.LC_ALL, '')
-except:
-    pass
+# Set the locale to handle UTF-8, only needed when the console isn't UTF-8 already
+_stdout_encoding = getattr(sys.stdout, "encoding", None)
+if _stdout_encoding and "utf" not in _stdout_encoding.lower():
+    try:
+        locale.setlocale(locale.LC_ALL, '')
+    except locale.Error:
+        pass
+
+# Extensions picked up when scanning the clip directory
+VIDEO_EXTENSIONS = frozenset(['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.3gp'])
+
+# Sidecar file storing ffprobe results, keyed by path, mtime and size
+CACHE_FILENAME = ".video_splitter_cache.json"
+# Bump whenever get_video_info changes what it returns, to drop stale entries
+CACHE_VERSION = 2
+
+def load_probe_cache(cache_path):
+    """Load cached ffprobe results, returning an empty cache on any error."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+            return {}
+        entries = cache.get("entries")
+        return entries if isinstance(entries, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_probe_cache(cache_path, cache):
+    """Write ffprobe results back to the sidecar cache file."""
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": cache}, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"Warning: could not write cache {cache_path}: {e}")
+
+def run_process(cmd):
+    """Run a command and return its stdout, draining stderr alongside it."""
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    output, errors = proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=output, stderr=errors)
+    return output
+
+def probe_scalar(file_path, entries):
+    """Run ffprobe on the first video stream and return its csv rows as tuples.
+
+    Every ffprobe section (stream, format) is printed as one row, with its
+    fields in ffprobe's own order. Fields containing a comma are quoted by
+    ffprobe, so rows are parsed with the csv module.
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", entries,
+        "-of", "csv=p=0",
+        file_path
+    ]
+    output = run_process(cmd).decode("utf-8", errors="replace")
+    return tuple(tuple(row) for row in csv.reader(output.splitlines()) if row)
 
 def get_video_info(file_path):
     """Get video codec and format information using ffprobe."""
     try:
-        cmd = [
-            "ffprobe", 
-            "-v", "quiet", 
-            "-print_format", "json", 
-            "-show_format", 
-            "-show_streams", 
-            file_path
-        ]
-        result = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        info = json.loads(result)
-        
-        # Find the video stream
-        video_stream = None
-        for stream in info.get("streams", []):
-            if stream.get("codec_type") == "video":
-                video_stream = stream
-                break
+        rows = probe_scalar(file_path, "stream=codec_name,width,height:format=format_name")
         
-        if not video_stream:
+        # Without a video stream only the format row is printed
+        if len(rows) < 2:
             return None
+        codec_name, width, height = rows[0][:3]
         
         return {
-            "codec_name": video_stream.get("codec_name"),
-            "width": video_stream.get("width"),
-            "height": video_stream.get("height"),
-            "format_name": info.get("format", {}).get("format_name"),
+            "codec_name": codec_name,
+            "width": int(width),
+            "height": int(height),
+            "format_name": rows[1][0],
             "file_path": file_path
         }
     except subprocess.CalledProcessError as e:
         print(f"Error analyzing {file_path}: {e}")
         return None
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"Error parsing ffprobe output for {file_path}: {e}")
         return None
 
-def check_videos_compatibility(video_files):
+def check_videos_compatibility(video_files, cache_path=None):
     """Check if all videos have compatible encoding for merging."""
     if not video_files:
         return False, "No video files found"
     
-    video_infos = []
-    for file_path in video_files:
-        info = get_video_info(file_path)
-        if info:
-            video_infos.append(info)
+    cache = load_probe_cache(cache_path) if cache_path else {}
+    video_infos = [None] * len(video_files)
+    keys = [None] * len(video_files)
+    to_probe = []
+    for i, file_path in enumerate(video_files):
+        stat = os.stat(file_path)
+        key = os.path.abspath(file_path)
+        keys[i] = [stat.st_mtime_ns, stat.st_size]
+        entry = cache.get(key)
+        if entry and entry.get("stat") == keys[i]:
+            video_infos[i] = dict(entry["info"], file_path=file_path)
         else:
+            to_probe.append(i)
+    
+    # ffprobe runs in child processes, so threads are enough to probe in parallel
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            probed = executor.map(get_video_info, [video_files[i] for i in to_probe])
+            for i, info in zip(to_probe, probed):
+                video_infos[i] = info
+                if info:
+                    cache[os.path.abspath(video_files[i])] = {"stat": keys[i], "info": info}
+        if cache_path:
+            save_probe_cache(cache_path, cache)
+    
+    for file_path, info in zip(video_files, video_infos):
+        if not info:
             return False, f"Could not get information for {file_path}"
     
     if not video_infos:
@@ -81,15 +147,15 @@ def check_videos_compatibility(video_files):
 
 def merge_videos(video_infos, output_path):
     """Merge video files using ffmpeg concat demuxer."""
-    # Create a temporary file with the list of files to concatenate
-    temp_file = "concat_list.txt"
-    with open(temp_file, "w", encoding="utf-8") as f:
-        for info in video_infos:
-            # Use Path object for better handling of Unicode paths
-            file_path = Path(info["file_path"]).absolute()
-            # Escape single quotes in file paths
-            escaped_path = str(file_path).replace("'", "'\\''")
-            f.write(f"file '{escaped_path}'\n")
+    # Build the list of files to concatenate in memory and feed it via stdin
+    lines = []
+    for info in video_infos:
+        # Use Path object for better handling of Unicode paths
+        file_path = Path(info["file_path"]).absolute()
+        # Escape single quotes in file paths
+        escaped_path = str(file_path).replace("'", "'\\''")
+        lines.append(f"file '{escaped_path}'\n")
+    manifest_bytes = "".join(lines).encode("utf-8")
     
     # Get the extension from the first file
     first_file_path = Path(video_infos[0]["file_path"])
@@ -107,40 +173,58 @@ def merge_videos(video_infos, output_path):
         "ffmpeg",
         "-f", "concat",
         "-safe", "0",
-        "-i", temp_file,
+        "-protocol_whitelist", "pipe,file",
+        "-i", "pipe:0",
         "-c", "copy",  # Use copy mode to avoid re-encoding
         "-y",  # Overwrite output file if it exists
         output_path
     ]
     
     try:
-        subprocess.check_call(cmd)
-        os.remove(temp_file)  # Clean up the temporary file
+        subprocess.run(cmd, input=manifest_bytes, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         return True, f"Successfully merged videos to {output_path}"
     except subprocess.CalledProcessError as e:
-        if os.path.exists(temp_file):
-            os.remove(temp_file)  # Clean up the temporary file
-        return False, f"Error merging videos: {e}"
+        # ffmpeg's stderr explains why the concat failed
+        details = e.stderr.decode("utf-8", errors="replace").strip() if e.stderr else ""
+        return False, f"Error merging videos: {e}\n{details}".rstrip()
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python ffmpeg-merge.py <directory_path>")
+    parser = OptionParser(usage="python ffmpeg-merge.py [options] <directory_path>")
+    parser.add_option("--assume-compatible",
+                      dest="assume_compatible",
+                      help="Skip the ffprobe compatibility check entirely; a"
+                           " codec or resolution mismatch may then produce a"
+                           " broken output file without any error",
+                      action="store_true"
+                      )
+    parser.add_option("--check-compatibility",
+                      dest="assume_compatible",
+                      help="Probe every clip for codec and resolution before"
+                           " merging (by default only the first and last clip"
+                           " are probed when all clips share the same"
+                           " extension)",
+                      action="store_false"
+                      )
+    (options, args) = parser.parse_args()
+    
+    if len(args) < 1:
+        parser.print_usage()
         sys.exit(1)
     
     # Use Path object for better handling of Unicode paths
-    directory_path = Path(sys.argv[1])
+    directory_path = Path(args[0])
     
     if not directory_path.is_dir():
         print(f"Error: {directory_path} is not a valid directory")
         sys.exit(1)
     
     # Get all video files in the directory
-    video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.mpg', '.mpeg', '.3gp']
-    video_files = []
-    
-    for file_path in directory_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in video_extensions:
-            video_files.append(str(file_path))
+    # DirEntry caches file type information, so only symlinks need a stat()
+    with os.scandir(directory_path) as entries:
+        video_files = [entry.path for entry in entries
+                       if entry.is_file()
+                       and os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS]
     
     # Sort video files by name
     video_files.sort()
@@ -153,22 +237,42 @@ def main():
     for file in video_files:
         print(f"  - {os.path.basename(file)}")
     
-    # Check if videos can be merged
-    compatible, result = check_videos_compatibility(video_files)
+    # Clips sharing an extension almost always come from the same split, so by
+    # default only the first and last clip are probed. With -c copy ffmpeg does
+    # not reliably fail on a mismatch, it may write a broken file instead.
+    assume_compatible = options.assume_compatible
+    if assume_compatible is None and len({os.path.splitext(f)[1].lower() for f in video_files}) == 1:
+        probe_files = [video_files[0], video_files[-1]] if len(video_files) > 1 else video_files
+    elif assume_compatible:
+        probe_files = []
+    else:
+        probe_files = video_files
     
-    if not compatible:
-        print(f"Error: {result}")
-        sys.exit(1)
+    if probe_files:
+        # Check if videos can be merged
+        compatible, result = check_videos_compatibility(probe_files, str(directory_path / CACHE_FILENAME))
+        
+        if not compatible:
+            print(f"Error: {result}")
+            sys.exit(1)
+    partial_check = len(probe_files) < len(video_files)
+    if partial_check:
+        print(f"Checked {len(probe_files)} of {len(video_files)} clips for compatibility; "
+              "use --check-compatibility to check them all.")
+    video_infos = [{"file_path": file_path} for file_path in video_files]
     
     # Merge videos
     # Output to the same directory as the input clips with name "output"
     output_path = directory_path / "output"
-    success, message = merge_videos(result, str(output_path))
+    success, message = merge_videos(video_infos, str(output_path))
     
     if success:
         print(message)
     else:
         print(f"Error: {message}")
+        if partial_check:
+            print("Not every clip was checked; re-run with "
+                  "--check-compatibility to find the mismatching clip.")
         sys.exit(1)
 
 if __name__ == "__main__":
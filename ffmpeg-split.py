@@ -10,18 +10,299 @@ import shlex
 import subprocess
 import sys
 import locale
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from optparse import OptionParser
 from pathlib import Path
 
-# Set the locale to handle UTF-8
+# PyAV is only needed for the optional "pyav" backend
 try:
-    locale.setlocale(locale.LC_ALL, '')
-except:
-    pass
+    import av
+except ImportError:
+    av = None
+
+# orjson is optional; it parses manifests faster than the stdlib json module
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Set the locale to handle UTF-8, only needed when the console isn't UTF-8 already
+_stdout_encoding = getattr(sys.stdout, "encoding", None)
+if _stdout_encoding and "utf" not in _stdout_encoding.lower():
+    try:
+        locale.setlocale(locale.LC_ALL, '')
+    except locale.Error:
+        pass
+
+
+def run_process(cmd, stdout=subprocess.PIPE):
+    """ Run a command and return its stdout.
+
+    communicate() drains stdout and stderr concurrently, so a chatty ffmpeg
+    can never block on a full pipe. stdin is closed so that parallel ffmpeg
+    processes don't read keystrokes from, or reconfigure, the terminal.
+
+    Arguments:
+        cmd (list)          - argv of the command to run.
+        stdout (int)        - Where to send stdout, subprocess.PIPE to
+                            capture it.
+    """
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=stdout,
+                            stderr=subprocess.PIPE)
+    output, errors = proc.communicate()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd, output=output,
+                                            stderr=errors)
+    return output
+
+
+def run_commands(commands, jobs=2):
+    """ Run ffmpeg commands concurrently.
+
+    Every command is an independent clip, so they can run side by side.
+    Errors are re-raised together with the offending command and its stderr.
+
+    Arguments:
+        commands (list)     - List of argv sequences to run.
+        jobs (int)          - Maximum number of concurrent ffmpeg processes.
+    """
+    jobs = max(1, jobs or 1)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        for cmd in commands:
+            print("About to run: " + " ".join(cmd))
+            future = executor.submit(run_process, cmd, stdout=subprocess.DEVNULL)
+            futures[future] = cmd
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except subprocess.CalledProcessError as e:
+                for pending in futures:
+                    pending.cancel()
+                print("Command failed: " + " ".join(futures[future]))
+                if e.stderr:
+                    print(e.stderr.decode("utf-8", errors="replace"))
+                raise
+
+
+def load_manifest_json(manifest):
+    """ Read and parse a json manifest file. """
+    with open(manifest) as manifest_file:
+        return json_loads(manifest_file.read())
+
+
+def clip_command(input_path, split_start, split_length, split_opts, output_path):
+    """ Build the ffmpeg argv that cuts a single clip.
+
+    -ss is given as an input option so ffmpeg seeks through the container
+    index instead of reading every packet up to the start time. With stream
+    copy the clip then starts at the nearest keyframe before split_start.
+
+    Arguments:
+        input_path (Path)   - Absolute location of the video.
+        split_start         - Clip start, in seconds or [HH:]MM:SS.
+        split_length        - Clip length, in seconds or [HH:]MM:SS.
+        split_opts (tuple)  - Output options shared by every clip.
+        output_path (str)   - Location of the clip.
+    """
+    return ("ffmpeg", "-ss", str(split_start), "-i", str(input_path),
+            "-t", str(split_length)) + split_opts + (output_path,)
+
+
+def split_filename(filename):
+    """ Return the (stem, extension) of a file name, split on the last dot. """
+    stem, dot, fileext = os.path.basename(filename).rpartition(".")
+    if not dot:
+        raise IndexError("No . in filename: " + filename)
+    return stem, fileext
+
+
+def parse_time(value):
+    """ Convert a manifest time (seconds or [HH:]MM:SS[.ms]) to seconds. """
+    seconds = 0.0
+    for part in str(value).split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def packet_time(packet):
+    """ Return the presentation time of a PyAV packet in seconds. """
+    pts = packet.pts if packet.pts is not None else packet.dts
+    return float(pts * packet.time_base)
+
+
+def split_with_pyav(filename, segments, keyframe_before_start=True):
+    """ Cut segments out of a video with PyAV in a single demux pass.
+
+    The input is opened once and packets are copied into every output whose
+    range contains them, with timestamps shifted to start at zero. Cuts are
+    only made at keyframes of the first video stream, walking packets in
+    decode order, so each output holds whole groups of pictures: it runs
+    from its start keyframe up to the first keyframe at or after its end.
+    The other streams are cut at the same times.
+
+    Arguments:
+        filename (str)      - Location of the video.
+        segments (list)     - List of (start, length, output_path) tuples,
+                            start and length in seconds.
+        keyframe_before_start (bool)
+                            - Start each output at the keyframe at or before
+                            its start, like ffmpeg -ss with stream copy.
+                            Otherwise start at the first keyframe at or
+                            after it, like the segment muxer, so back to
+                            back chunks leave no gap.
+    """
+    if not segments:
+        return
+
+    in_ctx = av.open(filename)
+    outputs = []
+    try:
+        in_streams = [stream for stream in in_ctx.streams
+                      if stream.type in ("video", "audio")]
+        video_streams = [stream for stream in in_streams if stream.type == "video"]
+        cut_index = (video_streams or in_streams)[0].index
+        other_count = len(in_streams) - 1
+
+        pending = sorted(({"start": start, "end": start + length, "path": output_path}
+                          for start, length, output_path in segments),
+                         key=lambda output: output["start"])
+        active = []
+
+        def mux(output, packet):
+            offset = round(output["start_time"] / packet.time_base)
+            packet.pts = (packet.pts if packet.pts is not None else packet.dts) - offset
+            packet.dts = packet.dts - offset
+            packet.stream = output["streams"][packet.stream.index]
+            output["ctx"].mux(packet)
+
+        def begin(output, start_time, buffered):
+            print("About to write: " + output["path"])
+            out_ctx = av.open(output["path"], "w")
+            outputs.append(out_ctx)
+            add_stream = getattr(out_ctx, "add_stream_from_template", None) or \
+                (lambda stream: out_ctx.add_stream(template=stream))
+            output.update(ctx=out_ctx, start_time=start_time, end_time=None,
+                          streams={stream.index: add_stream(stream) for stream in in_streams},
+                          finished=set())
+            pending.remove(output)
+            active.append(output)
+            for packet, time in buffered:
+                if packet.stream.index == cut_index or time >= start_time:
+                    mux(output, copy_packet(packet))
+
+        def finish(output):
+            active.remove(output)
+            outputs.remove(output["ctx"])
+            output["ctx"].close()
+
+        # Packets since the last cut keyframe, kept while an output may still
+        # have to start at that keyframe
+        buffered = []
+        buffer_time = None
+        last_time = None
+
+        first_start = pending[0]["start"]
+        if first_start > 0:
+            in_ctx.seek(int(first_start * av.time_base))
+
+        for packet in in_ctx.demux(in_streams):
+            # Flush packets carry no timestamps
+            if packet.dts is None:
+                continue
+            index = packet.stream.index
+            time = packet_time(packet)
+
+            if index == cut_index:
+                last_time = time
+                if packet.is_keyframe:
+                    if keyframe_before_start and buffer_time is not None:
+                        for output in [o for o in pending if o["start"] < time]:
+                            begin(output, buffer_time, buffered)
+                    for output in [o for o in active if o["end_time"] is None]:
+                        if output["end"] <= time:
+                            output["end_time"] = time
+                            if len(output["finished"]) == other_count:
+                                finish(output)
+                    for output in [o for o in pending if o["start"] <= time]:
+                        if output["end"] <= time:
+                            # Shorter than a group of pictures, nothing to cut
+                            pending.remove(output)
+                        else:
+                            begin(output, time, [])
+                    buffer_time = time
+                    buffered = [(p, t) for p, t in buffered
+                                if p.stream.index != cut_index and t >= time]
+                targets = [o for o in active if o["end_time"] is None]
+            else:
+                targets = []
+                for output in list(active):
+                    if output["end_time"] is not None and time >= output["end_time"]:
+                        output["finished"].add(index)
+                        if len(output["finished"]) == other_count:
+                            finish(output)
+                    elif time >= output["start_time"]:
+                        targets.append(output)
+
+            if keyframe_before_start and pending and buffer_time is not None:
+                buffered.append((copy_packet(packet), time))
+            elif not pending:
+                buffered = []
+                if not active:
+                    break
+
+            for n, output in enumerate(targets):
+                # mux() consumes the packet, so overlapping outputs get copies
+                mux(output, packet if n == len(targets) - 1 else copy_packet(packet))
+
+        # Outputs starting in the last group of pictures
+        if keyframe_before_start and buffer_time is not None:
+            for output in [o for o in pending if o["start"] <= last_time]:
+                begin(output, buffer_time, buffered)
+    finally:
+        for out_ctx in outputs:
+            out_ctx.close()
+        in_ctx.close()
+
+
+def copy_packet(packet):
+    """ Return a new PyAV packet with the same data and timing as packet.
+
+    mux() consumes the packet it is given, so a packet written to more than
+    one output needs a copy for all but the last.
+    """
+    copy = av.Packet(bytes(packet))
+    copy.stream = packet.stream
+    copy.pts = packet.pts
+    copy.dts = packet.dts
+    copy.time_base = packet.time_base
+    copy.duration = packet.duration
+    copy.is_keyframe = packet.is_keyframe
+    return copy
+
+
+def check_pyav_options(vcodec, acodec, extra):
+    """ Exit if PyAV is missing or the options need ffmpeg.
+
+    The pyav backend only copies streams, so codecs must be "copy" and no
+    extra ffmpeg options can be given. This runs before any output directory
+    is created or the input is probed.
+
+    Arguments:
+        vcodec (str)        - Video codec requested on the command line.
+        acodec (str)        - Audio codec requested on the command line.
+        extra (str)         - Extra options for ffmpeg.
+    """
+    if av is None:
+        print("The pyav backend requires PyAV: pip install av")
+        raise SystemExit
+    if vcodec != "copy" or acodec != "copy" or extra:
+        print("The pyav backend only supports stream copy without extra options")
+        raise SystemExit
 
 
 def split_by_manifest(filename, manifest, output_dir=None, vcodec="copy", acodec="copy",
-                      extra="", **kwargs):
+                      extra="", jobs=2, backend="ffmpeg", pre_parsed=None, **kwargs):
     """ Split video into segments based on the given manifest file.
 
     Arguments:
@@ -33,106 +314,116 @@ def split_by_manifest(filename, manifest, output_dir=None, vcodec="copy", acodec
         acodec (str)        - Controls the audio codec for the ffmpeg video
                             output.
         extra (str)         - Extra options for ffmpeg.
+        jobs (int)          - Number of ffmpeg processes to run in parallel.
+        backend (str)       - "ffmpeg" to run the ffmpeg CLI per clip, or
+                            "pyav" to copy all clips in one PyAV pass.
+        pre_parsed (object) - Already parsed json manifest, to avoid reading
+                            the file again.
     """
-    if not os.path.exists(manifest):
+    if backend == "pyav":
+        check_pyav_options(vcodec, acodec, extra)
+
+    if pre_parsed is None and not os.path.exists(manifest):
         print("File does not exist: %s" % manifest)
         raise SystemExit
 
-    with open(manifest) as manifest_file:
-        manifest_type = manifest.split(".")[-1]
-        if manifest_type == "json":
-            config_data = json.load(manifest_file)
-            
-            # 处理新格式的manifest.json
-            if isinstance(config_data, dict) and "input_file" in config_data and "output_clips" in config_data:
-                if not filename:  # 如果命令行未提供文件名，则使用配置中的
-                    filename = config_data["input_file"]
-                config = []
-                for i, clip in enumerate(config_data["output_clips"]):
-                    # 生成默认文件名 clip-{索引}
-                    fileext = filename.split(".")[-1]
-                    rename_to = f"clip-{i}.{fileext}"
-                    # 创建兼容现有代码的配置项
-                    config_item = {
-                        "start_time": clip["start_time"],
-                        "length": clip["length"],
-                        "rename_to": rename_to
-                    }
-                    config.append(config_item)
-            else:
-                config = config_data
-        elif manifest_type == "csv":
-            config = csv.DictReader(manifest_file)
+    manifest_type = manifest.split(".")[-1]
+    if manifest_type == "json":
+        if pre_parsed is not None:
+            config_data = pre_parsed
         else:
-            print("Format not supported. File must be a csv or json file")
-            raise SystemExit
+            config_data = load_manifest_json(manifest)
+        
+        # 处理新格式的manifest.json
+        if isinstance(config_data, dict) and "input_file" in config_data and "output_clips" in config_data:
+            if not filename:  # 如果命令行未提供文件名，则使用配置中的
+                filename = config_data["input_file"]
+            config = []
+            for i, clip in enumerate(config_data["output_clips"]):
+                # 生成默认文件名 clip-{索引}，扩展名稍后与输入文件一致
+                rename_to = f"clip-{i}"
+                # 创建兼容现有代码的配置项
+                config_item = {
+                    "start_time": clip["start_time"],
+                    "length": clip["length"],
+                    "rename_to": rename_to
+                }
+                config.append(config_item)
+        else:
+            config = config_data
+    elif manifest_type == "csv":
+        with open(manifest, newline="") as manifest_file:
+            config = list(csv.DictReader(manifest_file))
+    else:
+        print("Format not supported. File must be a csv or json file")
+        raise SystemExit
+
+    # 如果没有指定输出目录，则创建以输入文件名（不带扩展名）命名的文件夹，与输入文件在同一目录
+    if not output_dir and filename:
+        # 使用Path对象处理路径
+        input_path = Path(filename)
+        # 获取输入文件的目录
+        input_dir = input_path.parent
+        # 获取输入文件的基本名称（不带扩展名）
+        input_name_without_ext = input_path.stem
+        # 在输入文件的目录中创建以"Clip-"加文件名命名的文件夹
+        output_dir = str(input_dir / f"Clip-{input_name_without_ext}")
+        print(f"Creating output directory: {output_dir}")
 
-        # 如果没有指定输出目录，则创建以输入文件名（不带扩展名）命名的文件夹，与输入文件在同一目录
-        if not output_dir and filename:
-            # 使用Path对象处理路径
-            input_path = Path(filename)
-            # 获取输入文件的目录
-            input_dir = input_path.parent
-            # 获取输入文件的基本名称（不带扩展名）
-            input_name_without_ext = input_path.stem
-            # 在输入文件的目录中创建以"Clip-"加文件名命名的文件夹
-            output_dir = str(input_dir / f"Clip-{input_name_without_ext}")
-            print(f"Creating output directory: {output_dir}")
-
-        # Ensure the output directory exists
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        # Use Path object for better handling of Unicode paths
-        input_path = Path(filename).absolute()
-        split_cmd = ["ffmpeg", "-i", str(input_path), "-vcodec", vcodec,
-                     "-acodec", acodec, "-y"] + shlex.split(extra)
+    # Ensure the output directory exists
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Use Path object for better handling of Unicode paths
+    input_path = Path(filename).absolute()
+    # Output options shared by every clip; kept immutable so per-clip argv
+    # only adds the seek and output path
+    split_opts = tuple(["-vcodec", vcodec, "-acodec", acodec,
+                        "-avoid_negative_ts", "make_zero", "-y"] + shlex.split(extra))
+    fileext = split_filename(filename)[1]
+
+    commands = []
+    segments = []
+    for video_config in config:
         try:
-            fileext = filename.split(".")[-1]
-        except IndexError as e:
-            raise IndexError("No . in filename. Error: " + str(e))
+            split_start = video_config["start_time"]
+            split_length = video_config.get("end_time", None)
+            if not split_length:
+                split_length = video_config["length"]
+            filebase = video_config["rename_to"]
+            if filebase.endswith("." + fileext):
+                filebase = filebase[:-len(fileext) - 1]
+
+            output_path = os.path.join(output_dir or "", filebase + "." + fileext)
+
+            if backend == "pyav":
+                segments.append((parse_time(split_start), parse_time(split_length), output_path))
+            else:
+                commands.append(clip_command(input_path, split_start, split_length,
+                                             split_opts, output_path))
+        except KeyError as e:
+            print("############# Incorrect format ##############")
+            if manifest_type == "json":
+                print("The format of each json array should be:")
+                print("{start_time: <int>, length: <int>, rename_to: <string>}")
+                print("Or use new format with input_file and output_clips")
+            elif manifest_type == "csv":
+                print("start_time,length,rename_to should be the first line ")
+                print("in the csv file.")
+            print("#############################################")
+            print(e)
+            raise SystemExit
 
-        for video_config in config:
-            split_args = []
-            try:
-                split_start = video_config["start_time"]
-                split_length = video_config.get("end_time", None)
-                if not split_length:
-                    split_length = video_config["length"]
-                filebase = video_config["rename_to"]
-                if fileext in filebase:
-                    filebase = ".".join(filebase.split(".")[:-1])
-
-                # Ensure the output directory exists
-                if output_dir and not os.path.exists(output_dir):
-                    os.makedirs(output_dir)
-                
-                output_path = os.path.join(output_dir, filebase + "." + fileext) if output_dir else filebase + "." + fileext
-
-                split_args += ["-ss", str(split_start), "-t",
-                               str(split_length), output_path]
-                print("########################################################")
-                print("About to run: " + " ".join(split_cmd + split_args))
-                print("########################################################")
-                subprocess.check_output(split_cmd + split_args)
-            except KeyError as e:
-                print("############# Incorrect format ##############")
-                if manifest_type == "json":
-                    print("The format of each json array should be:")
-                    print("{start_time: <int>, length: <int>, rename_to: <string>}")
-                    print("Or use new format with input_file and output_clips")
-                elif manifest_type == "csv":
-                    print("start_time,length,rename_to should be the first line ")
-                    print("in the csv file.")
-                print("#############################################")
-                print(e)
-                raise SystemExit
+    if backend == "pyav":
+        split_with_pyav(str(input_path), segments)
+    else:
+        run_commands(commands, jobs)
 
 
 def get_video_length(filename):
-    output = subprocess.check_output(("ffprobe", "-v", "error", "-show_entries", "format=duration", "-of",
-                                      "default=noprint_wrappers=1:nokey=1", filename)).strip()
-    video_length = int(float(output))
+    output = run_process(("ffprobe", "-v", "error", "-show_entries", "format=duration", "-of",
+                          "default=noprint_wrappers=1:nokey=1", filename)).strip()
+    video_length = int(float(output.decode("ascii")))
     print("Video length in seconds: " + str(video_length))
 
     return video_length
@@ -143,7 +434,13 @@ def ceildiv(a, b):
 
 
 def split_by_seconds(filename, split_length, output_dir=None, vcodec="copy", acodec="copy",
-                     extra="", video_length=None, **kwargs):
+                     extra="", video_length=None, jobs=2, backend="ffmpeg", **kwargs):
+    if backend == "pyav":
+        check_pyav_options(vcodec, acodec, extra)
+
+    # 获取输入文件的基本名称（不带路径）和扩展名
+    filebase, fileext = split_filename(filename)
+
     if split_length and split_length <= 0:
         print("Split length can't be 0")
         raise SystemExit
@@ -168,31 +465,57 @@ def split_by_seconds(filename, split_length, output_dir=None, vcodec="copy", aco
         print(f"Creating output directory: {output_dir}")
 
     # Ensure the output directory exists
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
 
     # Use Path object for better handling of Unicode paths
     input_path = Path(filename).absolute()
-    split_cmd = ["ffmpeg", "-i", str(input_path), "-vcodec", vcodec, "-acodec", acodec] + shlex.split(extra)
-    try:
-        # 获取输入文件的基本名称（不带路径）
-        input_basename = os.path.basename(filename)
-        filebase = ".".join(input_basename.split(".")[:-1])
-        fileext = input_basename.split(".")[-1]
-    except IndexError as e:
-        raise IndexError("No . in filename. Error: " + str(e))
+    split_opts = tuple(["-vcodec", vcodec, "-acodec", acodec,
+                        "-avoid_negative_ts", "make_zero", "-y"] + shlex.split(extra))
+    # Output names are "<prefix><n><suffix>", only n changes per chunk
+    output_prefix = os.path.join(output_dir, filebase + "-")
+    output_suffix = f"-of-{split_count}.{fileext}"
+
+    if backend == "pyav":
+        split_with_pyav(str(input_path), [
+            (split_length * n, split_length, f"{output_prefix}{n+1}{output_suffix}")
+            for n in range(0, split_count)], keyframe_before_start=False)
+        return
+
+    if vcodec == "copy" and acodec == "copy":
+        # Stream copy: let the segment muxer cut every chunk in a single pass
+        # instead of re-opening and seeking the input once per chunk.
+        # Chunks end on keyframes, so the number written can differ from
+        # split_count; write temporary names and number them afterwards.
+        segment_base = os.path.join(output_dir, f".{filebase}-segment-")
+        segment_pattern = f"{segment_base.replace('%', '%%')}%d.{fileext}"
+        # Only video and audio are mapped: data tracks such as GoPro gpmd
+        # cannot be written to mp4 and ffmpeg's default selection skips them
+        segment_cmd = ["ffmpeg", "-i", str(input_path), "-c", "copy",
+                       "-map", "0:v", "-map", "0:a?", "-f", "segment", "-segment_time", str(split_length),
+                       "-reset_timestamps", "1", "-segment_start_number", "1"] + \
+            shlex.split(extra) + ["-y", segment_pattern]
+        run_commands([segment_cmd], jobs)
+
+        written = 0
+        while os.path.exists(f"{segment_base}{written + 1}.{fileext}"):
+            written += 1
+        for n in range(1, written + 1):
+            os.replace(f"{segment_base}{n}.{fileext}",
+                       f"{output_prefix}{n}-of-{written}.{fileext}")
+        return
+
+    commands = []
     for n in range(0, split_count):
-        split_args = []
         if n == 0:
             split_start = 0
         else:
             split_start = split_length * n
 
-        output_path = os.path.join(output_dir, f"{filebase}-{n+1}-of-{split_count}.{fileext}") if output_dir else f"{filebase}-{n+1}-of-{split_count}.{fileext}"
+        output_path = f"{output_prefix}{n+1}{output_suffix}"
+
+        commands.append(clip_command(input_path, split_start, split_length, split_opts, output_path))
 
-        split_args += ["-ss", str(split_start), "-t", str(split_length), output_path]
-        print("About to run: " + " ".join(split_cmd + split_args))
-        subprocess.check_output(split_cmd + split_args)
+    run_commands(commands, jobs)
 
 
 def main():
@@ -272,6 +595,24 @@ def main():
                       default="",
                       action="store"
                       )
+    parser.add_option("-j", "--jobs",
+                      dest="jobs",
+                      help="Number of ffmpeg processes to run in parallel"
+                           " [default: %default]",
+                      type="int",
+                      default=2,
+                      action="store"
+                      )
+    parser.add_option("-b", "--backend",
+                      dest="backend",
+                      help="Splitting backend: ffmpeg runs the ffmpeg CLI, pyav"
+                           " copies all clips in one pass with PyAV (stream"
+                           " copy only) [default: %default]",
+                      type="choice",
+                      action="store",
+                      choices=['ffmpeg', 'pyav'],
+                      default='ffmpeg'
+                      )
     (options, args) = parser.parse_args()
 
     def bailout():
@@ -280,23 +621,23 @@ def main():
 
     if options.manifest:
         # Check if manifest exists and might contain input_file
+        config_data = None
         if os.path.exists(options.manifest):
             manifest_type = options.manifest.split(".")[-1]
             if manifest_type == "json":
                 try:
-                    with open(options.manifest) as manifest_file:
-                        config_data = json.load(manifest_file)
-                        # If manifest has input_file, we don't need -f/--file
-                        if isinstance(config_data, dict) and "input_file" in config_data:
-                            split_by_manifest(**options.__dict__)
-                            return
+                    config_data = load_manifest_json(options.manifest)
+                    # If manifest has input_file, we don't need -f/--file
+                    if isinstance(config_data, dict) and "input_file" in config_data:
+                        split_by_manifest(pre_parsed=config_data, **options.__dict__)
+                        return
                 except (json.JSONDecodeError, IOError) as e:
                     print(f"Error reading manifest: {e}")
         
         # If we get here, we still need the filename
         if not options.filename:
             bailout()
-        split_by_manifest(**options.__dict__)
+        split_by_manifest(pre_parsed=config_data, **options.__dict__)
     elif not options.filename:
         bailout()
     else: